@@ -0,0 +1,74 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+def _any_of(words):
+    return "|".join(re.escape(word) for word in words)
+
+
+# Ordered rules: the first matching pattern wins, otherwise the default applies
+TOPIC_RULES = [
+    ("How-to", r"\bhow to\b|\bsteps\b|\bguide\b|\bconfigure\b|\bsetup\b|\bwalkthrough\b"),
+    ("Connector", _any_of(["snowflake", "redshift", "bigquery", "fivetran", "tableau", "airflow", "connector", "integration"])),
+    ("Lineage", _any_of(["lineage", "upstream", "downstream", "impact analysis", "data flow"])),
+    ("API/SDK", _any_of(["api", "sdk", "endpoint", "webhook"])),
+    ("SSO", _any_of(["sso", "single sign on", "saml", "okta", "azure ad", "login", "auth"])),
+    ("Glossary", _any_of(["glossary", "term", "definition"])),
+    ("Best practices", _any_of(["best practice", "recommendation", "guideline", "workflow", "scale", "catalog hygiene"])),
+    ("Sensitive data", _any_of(["pii", "hipaa", "gdpr", "sensitive", "masking", "dlp", "secrets manager"])),
+]
+DEFAULT_TOPIC = "Product"
+
+SENTIMENT_RULES = [
+    ("Frustrated", _any_of(["urgent", "asap", "blocked", "angry", "infuriating", "critical", "frustrated"])),
+    ("Curious", _any_of(["please", "could you", "wondering", "interested"])),
+]
+DEFAULT_SENTIMENT = "Neutral"
+
+PRIORITY_RULES = [
+    ("P0", _any_of(["urgent", "asap", "blocked", "critical", "infuriating"])),
+    ("P1", _any_of(["error", "fail", "not working", "problem", "issue"])),
+]
+DEFAULT_PRIORITY = "P2"
+
+# Topics answered by the RAG pipeline; everything else is routed to a team
+AI_TOPICS = {"How-to", "Product", "Best practices", "API/SDK", "SSO"}
+ROUTED_ANSWER = "This ticket has been classified as a '{topic}' issue and routed to the appropriate team."
+
+
+def _first_match(text, rules, default):
+    for label, pattern in rules:
+        if re.search(pattern, text):
+            return label
+    return default
+
+
+def classify_ticket(body, subject=""):
+    text = (subject + " " + body).lower()
+
+    topic = _first_match(text, TOPIC_RULES, DEFAULT_TOPIC)
+    sentiment = _first_match(text, SENTIMENT_RULES, DEFAULT_SENTIMENT)
+    priority = _first_match(text, PRIORITY_RULES, DEFAULT_PRIORITY)
+
+    return topic, sentiment, priority
+
+
+def _select(text, rules, default):
+    masks = [text.str.contains(pattern, regex=True) for _, pattern in rules]
+    return np.select(masks, [label for label, _ in rules], default=default)
+
+
+def classify_tickets(bodies, subjects):
+    """
+    Vectorized classify_ticket over whole columns of tickets.
+    Returns a DataFrame with topic, sentiment and priority columns.
+    """
+    text = (pd.Series(subjects, dtype="string").fillna("") + " " +
+            pd.Series(bodies, dtype="string").fillna("")).str.lower()
+
+    return pd.DataFrame({
+        "topic": _select(text, TOPIC_RULES, DEFAULT_TOPIC),
+        "sentiment": _select(text, SENTIMENT_RULES, DEFAULT_SENTIMENT),
+        "priority": _select(text, PRIORITY_RULES, DEFAULT_PRIORITY),
+    })
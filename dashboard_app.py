@@ -1,52 +1,8 @@
 import streamlit as st
 import psycopg
 from datetime import datetime
-from retriever import retrieve_and_summarize
-
-import re
-
-# ---------------------------
-# Ticket classification logic
-# ---------------------------
-def classify_ticket(body, subject=""):
-    text = (subject + " " + body).lower()
-
-    if re.search(r"\bhow to\b|\bsteps\b|\bguide\b|\bconfigure\b|\bsetup\b|\bwalkthrough\b", text):
-        topic = "How-to"
-    elif any(word in text for word in ["snowflake", "redshift", "bigquery", "fivetran", "tableau", "airflow", "connector", "integration"]):
-        topic = "Connector"
-    elif "lineage" in text or any(word in text for word in ["upstream", "downstream", "impact analysis", "data flow"]):
-        topic = "Lineage"
-    elif "api" in text or "sdk" in text or "endpoint" in text or "webhook" in text:
-        topic = "API/SDK"
-    elif "sso" in text or "single sign on" in text or "saml" in text or "okta" in text or "azure ad" in text or "login" in text or "auth" in text:
-        topic = "SSO"
-    elif "glossary" in text or "term" in text or "definition" in text:
-        topic = "Glossary"
-    elif "best practice" in text or "recommendation" in text or "guideline" in text or "workflow" in text or "scale" in text or "catalog hygiene" in text:
-        topic = "Best practices"
-    elif any(word in text for word in ["pii", "hipaa", "gdpr", "sensitive", "masking", "dlp", "secrets manager"]):
-        topic = "Sensitive data"
-    elif any(word in text for word in ["error", "fail", "issue", "bug", "not working", "problem", "crash", "role", "permission"]):
-        topic = "Product"
-    else:
-        topic = "Product"
-
-    if any(word in text for word in ["urgent", "asap", "blocked", "angry", "infuriating", "critical", "frustrated"]):
-        sentiment = "Frustrated"
-    elif any(word in text for word in ["please", "could you", "wondering", "interested"]):
-        sentiment = "Curious"
-    else:
-        sentiment = "Neutral"
-
-    if any(word in text for word in ["urgent", "asap", "blocked", "critical", "infuriating"]):
-        priority = "P0"
-    elif any(word in text for word in ["error", "fail", "not working", "problem", "issue"]):
-        priority = "P1"
-    else:
-        priority = "P2"
-
-    return topic, sentiment, priority
+from retriever import retrieve_and_stream
+from backend.services.classify import classify_ticket, AI_TOPICS, ROUTED_ANSWER
 
 # ---------------------------
 # Database Connection
@@ -104,7 +60,23 @@ elif page == "Dashboard":
     try:
         conn = get_connection()
         cur = conn.cursor()
-        cur.execute("SELECT id, subject, body FROM tickets ORDER BY created_at DESC;")
+        has_classifications = True
+        try:
+            # Use the classification precomputed by scripts/import_tickets.py
+            cur.execute("""
+                SELECT t.id, t.subject, t.body, c.topic, c.sentiment, c.priority
+                FROM tickets t
+                LEFT JOIN ticket_classifications c ON c.ticket_id = t.id
+                ORDER BY t.created_at DESC;
+            """)
+        except psycopg.errors.UndefinedTable:
+            # No bulk import has run yet
+            conn.rollback()
+            has_classifications = False
+            cur.execute("""
+                SELECT id, subject, body, NULL, NULL, NULL
+                FROM tickets ORDER BY created_at DESC;
+            """)
         tickets = cur.fetchall()
         conn.close()
     except Exception as e:
@@ -115,16 +87,19 @@ elif page == "Dashboard":
         st.info("No tickets found.")
     else:
         for ticket in tickets:
-            ticket_id, subject, body = ticket
+            ticket_id, subject, body, topic, sentiment, priority = ticket
             with st.expander(f"#{ticket_id}: {subject}"):
                 # Internal analysis
-                topic, sentiment, priority = classify_ticket(body, subject)
+                if topic is None:
+                    topic, sentiment, priority = classify_ticket(body, subject)
                 st.markdown("**Internal Analysis**")
                 st.write(f"**Topic:** {topic}")
                 st.write(f"**Sentiment:** {sentiment}")
                 st.write(f"**Priority:** {priority}")
 
                 # Fetch or generate final response
+                streamed = False
+                answer, citations = "", []
                 try:
                     conn = get_connection()
                     cur = conn.cursor()
@@ -133,16 +108,37 @@ elif page == "Dashboard":
                     if row:
                         answer, citations = row
                     else:
-                        if topic in {"How-to", "Product", "Best practices", "API/SDK", "SSO"}:
-                            with st.spinner("Generating AI response..."):
-                                answer, citations = retrieve_and_summarize(body)
-                            cur.execute("""
-                                INSERT INTO responses (ticket_id, topic, sentiment, priority, answer, citations, created_at)
-                                VALUES (%s, %s, %s, %s, %s, %s, NOW());
-                            """, (ticket_id, topic, sentiment, priority, answer, citations))
-                            conn.commit()
+                        if topic in AI_TOPICS:
+                            # Stream tokens as they are generated; persist once the stream completes
+                            st.markdown("**Final Response**")
+                            streamed = True
+                            timings = {}
+                            # Only fetched here: the embedding is 384 floats per ticket
+                            query_embedding = None
+                            if has_classifications:
+                                cur.execute("SELECT query_embedding FROM ticket_classifications WHERE ticket_id=%s;",
+                                            (ticket_id,))
+                                row = cur.fetchone()
+                                query_embedding = row[0] if row else None
+                            with st.spinner("Searching knowledge base..."):
+                                chunks, citations = retrieve_and_stream(body, timings, query_embedding)
+                            answer = st.write_stream(chunks)
+                            if "ttft" in timings:
+                                st.caption(f"⏱️ Time to first token: {timings['ttft']:.2f}s · Total: {timings['total']:.2f}s")
+                            else:
+                                st.caption(f"⏱️ No tokens generated, fallback response · Total: {timings['total']:.2f}s")
+                            if "error" in timings:
+                                # Don't persist a cut-off answer; the ticket is regenerated on the next visit
+                                st.error(f"Response generation did not complete ({timings['error']}). "
+                                         "It was not saved and will be retried.")
+                            else:
+                                cur.execute("""
+                                    INSERT INTO responses (ticket_id, topic, sentiment, priority, answer, citations, created_at)
+                                    VALUES (%s, %s, %s, %s, %s, %s, NOW());
+                                """, (ticket_id, topic, sentiment, priority, answer, citations))
+                                conn.commit()
                         else:
-                            answer = f"This ticket has been classified as a '{topic}' issue and routed to the appropriate team."
+                            answer = ROUTED_ANSWER.format(topic=topic)
                             citations = []
                             cur.execute("""
                                 INSERT INTO responses (ticket_id, topic, sentiment, priority, answer, citations, created_at)
@@ -152,12 +148,15 @@ elif page == "Dashboard":
                     conn.close()
                 except Exception as e:
                     st.error(f"Error generating or fetching response: {e}")
-                    answer = "Error generating response."
-                    citations = []
+                    # A streamed answer is already on the page; keep it rather than adding a second block
+                    if not streamed:
+                        answer = "Error generating response."
+                        citations = []
 
-                # Display final response
-                st.markdown("**Final Response**")
-                st.write(answer)
+                # Display final response (already rendered if it was streamed)
+                if not streamed:
+                    st.markdown("**Final Response**")
+                    st.write(answer)
                 if citations:
                     st.markdown("**Citations:**")
                     for url in citations:
@@ -1,9 +1,13 @@
 import os
 import json
+import time
+from functools import lru_cache
+from threading import Event, Thread
 import numpy as np
 import faiss
+import torch
 from sentence_transformers import SentenceTransformer
-from transformers import pipeline
+from transformers import pipeline, StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
 
 
 class Retriever:
@@ -67,7 +71,7 @@ class Retriever:
                 len(self.metadata) > 0 and 
                 self.embedding_model is not None)
 
-    def search(self, query, top_k=5):
+    def search(self, query, top_k=5, query_embedding=None):
         if not self.is_ready():
             return []
 
@@ -75,8 +79,10 @@ class Retriever:
             return []
 
         try:
-            query_embedding = self.embedding_model.encode([query.strip()])
-            query_embedding = np.array(query_embedding).astype('float32')
+            # Reuse an embedding precomputed at import time when one is supplied
+            if query_embedding is None:
+                query_embedding = self.embedding_model.encode([query.strip()])
+            query_embedding = np.array(query_embedding).astype('float32').reshape(1, -1)
 
             if query_embedding.shape[1] != self.faiss_index.d:
                 return []
@@ -100,16 +106,47 @@ class Retriever:
             return []
 
 
+MAX_NEW_TOKENS = 150
+STREAM_TIMEOUT = 60  # seconds to wait for the next token before giving up
+
+
+@lru_cache(maxsize=1)
+def load_retriever():
+    """Load the embedding model, FAISS index and metadata once per process"""
+    return Retriever()
+
+
+def get_retriever():
+    retriever = load_retriever()
+    if not retriever.is_ready():
+        # Don't pin a half-loaded retriever; retry on the next request
+        load_retriever.cache_clear()
+    return retriever
+
+
+@lru_cache(maxsize=1)
+def load_generator():
+    """Load the GPT-2 pipeline once per process so requests don't pay the model load"""
+    generator = pipeline("text-generation", model="gpt2", max_length=512)
+    # Long tickets are cut from the front so the question's end and "Answer:" survive
+    generator.tokenizer.truncation_side = "left"
+    return generator
+
+
+def build_prompt(context, query):
+    return f"Context: {context[:500]}\n\nQuestion: {query}\n\nAnswer:"
+
+
 def generate_with_huggingface(context, query):
     """Use Hugging Face GPT-2 (simple and ungated)"""
     try:
-        generator = pipeline("text-generation", model="gpt2", max_length=512)
+        generator = load_generator()
 
-        prompt = f"Context: {context[:500]}\n\nQuestion: {query}\n\nAnswer:"
+        prompt = build_prompt(context, query)
 
         response = generator(
             prompt,
-            max_new_tokens=150,
+            max_new_tokens=MAX_NEW_TOKENS,
             do_sample=True,
             temperature=0.7,
             pad_token_id=50256
@@ -124,12 +161,173 @@ def generate_with_huggingface(context, query):
         return None
 
 
+class _StopOnEvent(StoppingCriteria):
+    """Stops generate() once the consumer of the stream has given up on it"""
+
+    def __init__(self, event):
+        self.event = event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
+
+
+# generate() threads whose stream was abandoned (timeout, error, closed page) but that haven't exited yet
+_abandoned_generations = []
+
+
+def stream_with_huggingface(context, query):
+    """Yield GPT-2 text pieces as they are sampled instead of waiting for all 150 tokens"""
+    _abandoned_generations[:] = [t for t in _abandoned_generations if t.is_alive()]
+    if _abandoned_generations:
+        print(f"⚠️ {len(_abandoned_generations)} abandoned generation thread(s) still running")
+
+    generator = load_generator()
+    tokenizer = generator.tokenizer
+    model = generator.model
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=STREAM_TIMEOUT)
+    stop = Event()
+
+    inputs = tokenizer(
+        build_prompt(context, query),
+        return_tensors="pt",
+        truncation=True,
+        max_length=model.config.n_positions - MAX_NEW_TOKENS
+    ).to(model.device)
+
+    errors = []
+
+    def _generate():
+        # Exceptions in the worker thread would otherwise leave the streamer waiting forever
+        try:
+            model.generate(
+                **inputs,
+                streamer=streamer,
+                stopping_criteria=StoppingCriteriaList([_StopOnEvent(stop)]),
+                max_new_tokens=MAX_NEW_TOKENS,
+                do_sample=True,
+                temperature=0.7,
+                pad_token_id=50256
+            )
+        except Exception as e:
+            errors.append(e)
+        finally:
+            streamer.end()
+
+    thread = Thread(target=_generate, daemon=True)
+    thread.start()
+    finished = False
+    try:
+        for text in streamer:
+            if text:
+                yield text
+        finished = True
+    finally:
+        if not finished:
+            # Timed out or abandoned: ask generate() to stop at its next token
+            stop.set()
+            _abandoned_generations.append(thread)
+            print("⚠️ Stopping abandoned generation thread")
+    thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def _timed_stream(chunks, timings, start):
+    """Record the total time (seconds from request start) into `timings` once the stream is consumed"""
+    yield from chunks
+    timings["total"] = time.perf_counter() - start
+    if "ttft" in timings:
+        print(f"⏱️ Time to first token: {timings['ttft']:.2f}s (total {timings['total']:.2f}s)")
+    else:
+        print(f"⏱️ No tokens generated, fallback response (total {timings['total']:.2f}s)")
+
+
+def retrieve_and_stream(query, timings=None, query_embedding=None):
+    """
+    Retrieve relevant docs and stream a GPT-2 answer.
+
+    Returns (chunks, citations): citations are resolved up front, chunks is an
+    iterator of text pieces. If `timings` is a dict it is filled in as the
+    stream is consumed:
+      - "load": one-off model loading time, excluded from the other figures
+      - "ttft": seconds to the first GPT-2 token (absent if none was generated)
+      - "total": seconds until the stream ended
+      - "fallback": True if the answer includes canned or documentation text
+      - "error": set when generation failed or timed out; the answer is incomplete
+    `query_embedding` may carry the vector precomputed by the bulk importer.
+    """
+    if timings is None:
+        timings = {}
+
+    def _single(text):
+        timings["fallback"] = True
+        yield text
+
+    # Load models before starting the clock so one-off loads don't count towards time-to-first-token
+    load_start = time.perf_counter()
+    try:
+        retriever = get_retriever()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        retriever = None
+    if retriever is not None and retriever.is_ready():
+        try:
+            load_generator()
+        except Exception as e:
+            # Raised again, and reported, by the stream below
+            print(f"❌ Hugging Face error: {e}")
+    start = time.perf_counter()
+    timings["load"] = start - load_start
+
+    if retriever is None:
+        return _timed_stream(_single("An error occurred processing your request."), timings, start), ["https://docs.atlan.com"]
+
+    try:
+        if not retriever.is_ready():
+            return _timed_stream(_single("Knowledge base not ready."), timings, start), ["https://docs.atlan.com"]
+
+        search_results = retriever.search(query.strip(), top_k=3, query_embedding=query_embedding)
+        if not search_results:
+            return _timed_stream(_single("No relevant information found."), timings, start), ["https://docs.atlan.com"]
+
+        context_pieces = [r['content'] for r in search_results if r['content'].strip()]
+        citations = list(set([r['source_url'] for r in search_results if r['source_url']]))
+        context = "\n\n".join(context_pieces[:2])
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return _timed_stream(_single("An error occurred processing your request."), timings, start), ["https://docs.atlan.com"]
+
+    def _chunks():
+        streamed = ""
+        try:
+            for text in stream_with_huggingface(context, query):
+                if not streamed:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                    timings["ttft"] = time.perf_counter() - start
+                streamed += text
+                yield text
+        except Exception as e:
+            # queue.Empty (streamer timeout) has no message
+            timings["error"] = str(e) or f"no token within {STREAM_TIMEOUT}s"
+            print(f"❌ Hugging Face error: {timings['error']}")
+
+        if "error" in timings or len(streamed.strip()) <= 10:
+            timings["fallback"] = True
+            prefix = "\n\n" if streamed else ""
+            yield f"{prefix}Based on the documentation, here's what I found:\n\n{context[:600]}"
+
+    return _timed_stream(_chunks(), timings, start), citations[:3]
+
+
 def retrieve_and_summarize(query):
     """
     Retrieve relevant docs and summarize using Hugging Face GPT-2
     """
     try:
-        retriever = Retriever()
+        retriever = get_retriever()
         if not retriever.is_ready():
             return "Knowledge base not ready.", ["https://docs.atlan.com"]
 
@@ -164,6 +362,13 @@ def test():
     for citation in citations:
         print(f"  - {citation}")
 
+    print("\n🧪 Testing streaming output...")
+    timings = {}
+    chunks, citations = retrieve_and_stream(query, timings)
+    for text in chunks:
+        print(text, end="", flush=True)
+    print()
+
 
 if __name__ == "__main__":
     print("✅ Using Hugging Face GPT-2 only")
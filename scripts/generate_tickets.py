@@ -0,0 +1,56 @@
+# scripts/generate_tickets.py
+#
+# Build a synthetic ticket backlog from data/sample_tickets.json for benchmarking
+# scripts/import_tickets.py. Each ticket gets a unique source id (BULK-<n>).
+#
+# Usage (from the repo root):
+#   python -m scripts.generate_tickets 100000 /tmp/tickets_100k.jsonl
+#   python -m scripts.generate_tickets 100000 /tmp/tickets_100k.json   # JSON array
+
+import json
+import random
+import argparse
+from pathlib import Path
+
+SAMPLE_TICKETS = Path("data/sample_tickets.json")
+
+
+def generate(count, seed=0):
+    with open(SAMPLE_TICKETS, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+
+    rng = random.Random(seed)
+    for i in range(count):
+        ticket = rng.choice(samples)
+        yield {
+            "id": f"BULK-{i}",
+            "subject": ticket["subject"],
+            "body": ticket["body"],
+            "customer_email": f"user{i}@example.com",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic ticket file for import benchmarks.")
+    parser.add_argument("count", type=int, help="number of tickets")
+    parser.add_argument("output", type=Path, help=".jsonl for JSON Lines, anything else for a JSON array")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    as_lines = args.output.suffix.lower() in {".jsonl", ".ndjson"}
+    with open(args.output, "w", encoding="utf-8") as f:
+        if not as_lines:
+            f.write("[\n")
+        for i, ticket in enumerate(generate(args.count, args.seed)):
+            if as_lines:
+                f.write(json.dumps(ticket) + "\n")
+            else:
+                f.write(("" if i == 0 else ",\n") + json.dumps(ticket))
+        if not as_lines:
+            f.write("\n]\n")
+
+    print(f"✅ Wrote {args.count} tickets to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# scripts/import_tickets.py
+#
+# Bulk-load a ticket backlog into Postgres with COPY, classifying each batch
+# on the way in so the responses pipeline can pick the tickets up immediately.
+#
+# Usage (from the repo root):
+#   python -m scripts.import_tickets data/sample_tickets.json
+#   python -m scripts.import_tickets export.jsonl --dsn postgresql://localhost/support --embed
+#
+# JSON Lines, CSV and top-level JSON arrays are read incrementally, so file size is
+# not bounded by memory. A JSON object wrapping the list ({"tickets": [...]}) is
+# loaded whole; convert very large exports of that shape to JSON Lines first.
+#
+# A ticket's source id ("id" or "external_id", e.g. "TICKET-245") is recorded, and
+# ids that were already imported are skipped, so a failed migration can be re-run.
+# Tickets without a source id cannot be deduplicated.
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+import psycopg
+from dotenv import load_dotenv
+
+from backend.services.classify import classify_tickets, AI_TOPICS, ROUTED_ANSWER
+
+# Load environment variables
+load_dotenv()
+
+BATCH_SIZE = 5000
+READ_SIZE = 1 << 16  # characters read at a time when streaming a JSON array
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+CREATE_CLASSIFICATIONS = """
+    CREATE TABLE IF NOT EXISTS ticket_classifications (
+        ticket_id integer PRIMARY KEY REFERENCES tickets(id) ON DELETE CASCADE,
+        external_id text UNIQUE,
+        topic text NOT NULL,
+        sentiment text NOT NULL,
+        priority text NOT NULL,
+        query_embedding real[],
+        created_at timestamp without time zone NOT NULL DEFAULT NOW()
+    );
+"""
+
+
+def iter_json_array(f):
+    """Yield the elements of a top-level JSON array one at a time, without loading the file."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    skip(" \t\r\n")
+    if buf[pos:pos + 1] != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise ValueError("unterminated JSON array")
+        if buf[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        if (end == len(buf) or buf[end] not in " \t\r\n,]") and not eof:
+            # A bare number may continue in the next chunk ("4." then "5e3")
+            fill()
+            continue
+        pos = end
+        yield value
+
+
+def read_tickets(path: Path):
+    """Yield ticket dicts from a JSON array, JSON Lines or CSV file."""
+    suffix = path.suffix.lower()
+    # utf-8-sig drops the BOM Excel and many helpdesk exports put before the first header
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if suffix in {".jsonl", ".ndjson"}:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        elif suffix == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            head = f.read(READ_SIZE).lstrip()
+            f.seek(0)
+            if head.startswith("["):
+                yield from iter_json_array(f)
+            else:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    data = data.get("tickets", [data])
+                yield from data
+
+
+def batched(records, size):
+    it = iter(records)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def reserve_ids(cur, n):
+    """Allocate n ticket ids up front so COPY can write tickets and their classifications together."""
+    cur.execute(
+        "SELECT nextval(pg_get_serial_sequence('tickets', 'id')) FROM generate_series(1, %s);",
+        (n,)
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def external_id(record):
+    value = record.get("external_id") or record.get("id")
+    return str(value) if value not in (None, "") else None
+
+
+def parse_created_at(value, default):
+    """Return a naive local datetime, `default` when empty, or None when unparseable."""
+    if value in (None, ""):
+        return default
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def clean_ticket(record, now):
+    """Normalise one input record, or return None if it can't be loaded as a ticket."""
+    if not isinstance(record, dict):
+        return None
+    subject = record.get("subject")
+    body = record.get("body")
+    if not isinstance(subject, str) or not isinstance(body, str) or not subject.strip() or not body.strip():
+        return None
+    created_at = parse_created_at(record.get("created_at"), now)
+    if created_at is None:
+        return None
+    email = record.get("customer_email")
+    return {
+        "external_id": external_id(record),
+        "subject": subject,
+        "body": body,
+        "customer_email": str(email) if email not in (None, "") else None,
+        "created_at": created_at,
+    }
+
+
+def drop_imported(cur, tickets):
+    """Drop tickets whose source id is already in the database or repeated earlier in the batch."""
+    ids = [t["external_id"] for t in tickets]
+    cur.execute(
+        "SELECT external_id FROM ticket_classifications WHERE external_id = ANY(%s);",
+        ([i for i in ids if i is not None],)
+    )
+    seen = {row[0] for row in cur.fetchall()}
+
+    fresh = []
+    for ticket, ext_id in zip(tickets, ids):
+        if ext_id is not None:
+            if ext_id in seen:
+                continue
+            seen.add(ext_id)
+        fresh.append(ticket)
+    return fresh
+
+
+def load_batch(conn, records, embeddings_model=None):
+    """
+    COPY one batch of tickets, their classifications and routed responses.
+    Returns (loaded, invalid, duplicates) row counts.
+    """
+    now = datetime.now()
+    cleaned = [clean_ticket(r, now) for r in records]
+    tickets = [t for t in cleaned if t is not None]
+    invalid = len(records) - len(tickets)
+
+    with conn.cursor() as cur:
+        fresh = drop_imported(cur, tickets)
+    # Close the read transaction so it isn't held open while classifying and embedding
+    conn.commit()
+    duplicates = len(tickets) - len(fresh)
+    tickets = fresh
+    if not tickets:
+        return 0, invalid, duplicates
+
+    subjects = [t["subject"] for t in tickets]
+    bodies = [t["body"] for t in tickets]
+    labels = classify_tickets(bodies, subjects)
+
+    embeddings = None
+    if embeddings_model is not None:
+        # Same input the dashboard passes to Retriever.search
+        embeddings = embeddings_model.encode([b.strip() for b in bodies], batch_size=64, convert_to_numpy=True)
+
+    # Everything below is one short write transaction
+    with conn.cursor() as cur:
+        ids = reserve_ids(cur, len(tickets))
+
+        with cur.copy("COPY tickets (id, subject, body, customer_email, created_at) FROM STDIN") as copy:
+            for ticket_id, t in zip(ids, tickets):
+                copy.write_row((ticket_id, t["subject"], t["body"], t["customer_email"], t["created_at"]))
+
+        with cur.copy(
+            "COPY ticket_classifications (ticket_id, external_id, topic, sentiment, priority, query_embedding) "
+            "FROM STDIN"
+        ) as copy:
+            for i, (ticket_id, t, topic, sentiment, priority) in enumerate(
+                zip(ids, tickets, labels["topic"], labels["sentiment"], labels["priority"])
+            ):
+                embedding = embeddings[i].tolist() if embeddings is not None else None
+                copy.write_row((ticket_id, t["external_id"], topic, sentiment, priority, embedding))
+
+        # Tickets outside the RAG topics only need their routing note, so answer them now
+        with cur.copy(
+            "COPY responses (ticket_id, topic, sentiment, priority, answer, citations, created_at) FROM STDIN"
+        ) as copy:
+            for ticket_id, topic, sentiment, priority in zip(
+                ids, labels["topic"], labels["sentiment"], labels["priority"]
+            ):
+                if topic not in AI_TOPICS:
+                    copy.write_row((ticket_id, topic, sentiment, priority,
+                                    ROUTED_ANSWER.format(topic=topic), [], now))
+
+    conn.commit()
+    return len(tickets), invalid, duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import support tickets into Postgres with COPY.")
+    parser.add_argument("path", type=Path, help="JSON, JSON Lines or CSV file of tickets (subject, body)")
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"),
+                        help="Postgres connection string (default: $DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--embed", action="store_true",
+                        help=f"precompute {EMBEDDING_MODEL} query embeddings for each ticket")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="abort on the first failed batch instead of skipping it")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("no database configured: pass --dsn or set DATABASE_URL")
+
+    embeddings_model = None
+    if args.embed:
+        from sentence_transformers import SentenceTransformer
+        print(f"Loading embedding model {EMBEDDING_MODEL}...")
+        embeddings_model = SentenceTransformer(EMBEDDING_MODEL)
+
+    total_loaded = 0
+    total_invalid = 0
+    total_duplicates = 0
+    failed_batches = 0
+    failed_rows = 0
+    start = time.perf_counter()
+
+    with psycopg.connect(args.dsn) as conn:
+        conn.execute(CREATE_CLASSIFICATIONS)
+        conn.commit()
+
+        for batch_num, batch in enumerate(batched(read_tickets(args.path), args.batch_size), start=1):
+            try:
+                loaded, invalid, duplicates = load_batch(conn, batch, embeddings_model)
+            except Exception as e:
+                conn.rollback()
+                failed_batches += 1
+                failed_rows += len(batch)
+                print(f"  ❌ Batch {batch_num} failed ({len(batch)} tickets not loaded): {e}")
+                if args.stop_on_error:
+                    break
+                continue
+            total_loaded += loaded
+            total_invalid += invalid
+            total_duplicates += duplicates
+            elapsed = time.perf_counter() - start
+            print(f"  ✓ Batch {batch_num}: {loaded} tickets ({total_loaded / elapsed:.1f} tickets/sec)")
+
+    elapsed = time.perf_counter() - start
+    print("\n--- Summary ---")
+    print(f"Tickets loaded: {total_loaded}")
+    print(f"Skipped (invalid: missing or non-text subject/body, bad created_at): {total_invalid}")
+    print(f"Skipped (already imported): {total_duplicates}")
+    print(f"Failed: {failed_rows} tickets in {failed_batches} batches")
+    print(f"Total time: {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"Throughput: {total_loaded / elapsed:.1f} tickets/sec")
+
+    if failed_batches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()